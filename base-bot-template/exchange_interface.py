@@ -6,7 +6,9 @@ from __future__ import annotations
 import random
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Callable, Dict, List, Protocol
+from typing import Callable, Dict, List, Protocol, Union
+
+import numpy as np
 
 
 @dataclass
@@ -14,12 +16,22 @@ class MarketSnapshot:
     """Minimal market view shared with strategies."""
 
     symbol: str
-    prices: List[float]
+    prices: np.ndarray
     current_price: float
-    timestamp: datetime
+    timestamp: Union[datetime, np.int64]  # live exchanges use datetime; replays use epoch-ns
+
+    def __post_init__(self) -> None:
+        # Convert once here so strategies can take zero-copy views every tick.
+        # float32 histories are kept as-is; anything else becomes float64.
+        prices = np.asarray(self.prices)
+        if prices.dtype != np.float32:
+            prices = prices.astype(np.float64, copy=False)
+        self.prices = prices
+        # A numpy scalar here would leak into signal sizes and persisted state
+        self.current_price = float(self.current_price)
 
     @property
-    def history(self) -> List[float]:
+    def history(self) -> np.ndarray:
         """Convenience alias used by strategies."""
         return self.prices
 
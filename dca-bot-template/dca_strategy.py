@@ -424,7 +424,7 @@ class AdvancedDcaStrategy(BaseStrategy):
         current_price = market.current_price
         if not self.entries:
             recent_prices = market.prices[-self.volatility_window :] if len(market.prices) >= self.volatility_window else market.prices
-            reference = max(recent_prices) if recent_prices else current_price
+            reference = max(recent_prices) if len(recent_prices) else current_price
             if reference <= 0:
                 return self.base_drop_pct
             return max(self.base_drop_pct, (reference - current_price) / reference * 100)
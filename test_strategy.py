@@ -1,22 +1,21 @@
 #!/usr/bin/env python3
 """Simple test for high-conviction ultra-profit strategy."""
 
-import sys
-import os
-
-# Add paths
-base_path = os.path.join(os.path.dirname(__file__), 'base-bot-template')
-strategy_path = os.path.join(os.path.dirname(__file__), 'your-strategy-template')
-sys.path.insert(0, base_path)
-sys.path.insert(0, strategy_path)
-
-# Import strategy
+# Import strategy first (installed with `pip install -e .`): it puts the
+# base template on sys.path for the imports below
 import your_strategy
+import indicators_nb
+import streaming
 
 # Import required classes
 from strategy_interface import Portfolio
 from exchange_interface import MarketSnapshot
-from datetime import datetime
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
 
 def test_strategy():
     """Test the high-conviction ultra-profit strategy logic."""
@@ -50,27 +49,21 @@ def test_strategy():
     
     # Create strategy instance
     exchange = MockExchange()
-    strategy = your_strategy.HighConvictionUltraProfitStrategy(config, exchange)
+    strategy = your_strategy.HighConvictionUltraProfitStrategy(your_strategy.StrategyConfig(**config), exchange)
     
     # Create mock market data (strong oversold condition)
-    prices = []
     base_price = 45000
-    # Create strong oversold condition - prices dropping then sharp recovery
-    for i in range(30):
-        if i < 10:
-            # Sharp drop
-            price = base_price - i * 300
-        else:
-            # Strong recovery
-            price = base_price - 3000 + (i - 10) * 400
-        prices.append(price)
+    # Create strong oversold condition - sharp drop then strong recovery
+    i = np.arange(30)
+    prices = np.where(i < 10, base_price - i * 300, base_price - 3000 + (i - 10) * 400).astype(np.float32)
     
     market = MarketSnapshot(
         symbol="BTC-USD",
         current_price=prices[-1],
         prices=prices,
-        timestamp=datetime.now()
+        timestamp=np.int64(time.time_ns())
     )
+    assert type(market.current_price) is float
     
     # Create mock portfolio
     portfolio = Portfolio(
@@ -85,5 +78,223 @@ def test_strategy():
     
     print("Strategy test completed successfully!")
 
+def test_streaming_matches_batch_kernels():
+    """Seeded streaming state must agree with the batch kernels bar by bar."""
+    rng = np.random.default_rng(7)
+    closes = 45000 + np.cumsum(rng.normal(0, 150, 120))
+    
+    rsi_alpha = indicators_nb.wilder_alpha(14)
+    macd_args = (12, indicators_nb.span_alpha(12), 26, indicators_nb.span_alpha(26),
+                 9, indicators_nb.span_alpha(9))
+    
+    rsi_batch = indicators_nb.rsi_wilder(closes, 14, rsi_alpha)
+    bb_batch = indicators_nb.bbands(closes, 20, 2.0)
+    macd_batch = indicators_nb.macd(closes, *macd_args)
+    # Seed both inside and past the MACD warmup (slow + signal - 1 bars)
+    for seed_len in (10, 40):
+        rsi = streaming.RSIState(14, rsi_alpha)
+        bb = streaming.BBState(20, 2.0)
+        macd = streaming.MACDState(*macd_args)
+        vol = streaming.VolState(20)
+        for state in (rsi, bb, macd, vol):
+            # Re-seed over an earlier, longer run: nothing of it may survive
+            state.seed(closes[::-1])
+            state.seed(closes[:seed_len])
+        
+        for i in range(seed_len, closes.size):
+            price = closes[i]
+            rsi_value, bb_value, macd_value = rsi.update(price), bb.update(price), macd.update(price)
+            vol_value = vol.update(price)
+            if i >= 14:
+                assert np.isclose(rsi_value, rsi_batch[i])
+            if i >= 19:
+                assert np.allclose(bb_value, [band[i] for band in bb_batch])
+                assert np.isclose(vol_value, indicators_nb.volatility(closes[:i + 1], 20))
+            if i >= 26 + 9 - 2:
+                assert np.allclose(macd_value, [line[i] for line in macd_batch])
+            else:
+                assert macd_value is None
+    
+    print("Streaming indicators match batch kernels!")
+
+def test_batch_signals_match_per_tick_conviction():
+    """The batch conviction filter must agree with the per-tick score on every bar."""
+    rng = np.random.default_rng(11)
+    closes = 45000 * np.exp(np.cumsum(rng.normal(0, 0.01, 400)))
+    strategy = your_strategy.HighConvictionUltraProfitStrategy(
+        {"conviction_threshold": 0.3}, None, warmup=False
+    )
+    
+    batch = strategy.generate_signals_batch(closes)
+    expected = np.zeros(closes.size, dtype=np.int8)
+    min_history = max(strategy.rsi_period, strategy.bb_period, strategy.macd_slow)
+    for i in range(closes.size):
+        market = MarketSnapshot(symbol="BTC-USD", prices=closes[:i + 1],
+                                current_price=closes[i], timestamp=np.int64(i))
+        strategy._update_indicators(market)
+        if i + 1 >= min_history:
+            score, _ = strategy._high_conviction_signal(market)
+            if abs(score) >= strategy.conviction_threshold:
+                expected[i] = 1 if score > 0 else -1
+    
+    assert np.count_nonzero(expected) > 0
+    assert np.array_equal(batch, expected)
+    assert np.array_equal(strategy.generate_signals_batch(np.stack([closes, closes]))[1], expected)
+    
+    print("Batch signals match per-tick conviction!")
+
+def test_repeated_bar_revises_streaming_state():
+    """Polling an open candle repeatedly must revise that bar, not append new ones."""
+    rng = np.random.default_rng(5)
+    closes = 45000 * np.exp(np.cumsum(rng.normal(0, 0.01, 80)))
+    strategy = your_strategy.HighConvictionUltraProfitStrategy({}, None, warmup=False)
+    rsi_alpha = indicators_nb.wilder_alpha(14)
+    macd_args = (12, indicators_nb.span_alpha(12), 26, indicators_nb.span_alpha(26),
+                 9, indicators_nb.span_alpha(9))
+    
+    def assert_matches_batch(prices):
+        expected = [indicators_nb.rsi_wilder(prices, 14, rsi_alpha)[-1],
+                    *(band[-1] for band in indicators_nb.bbands(prices, 20, 2.0)),
+                    *(line[-1] for line in indicators_nb.macd(prices, *macd_args)),
+                    indicators_nb.volatility(prices, 20)]
+        actual = [strategy._rsi_value, *strategy._bb_value, *strategy._macd_value, strategy._vol_value]
+        assert np.allclose(actual, expected)
+    
+    bar_ns = np.int64(900 * 10**9)
+    for i in range(closes.size):
+        # A few intrabar polls on one candle timestamp; every seventh bar's
+        # last poll misses its final close, so the next bar must re-seed
+        polls = [*(closes[i] * (1 + rng.normal(0, 0.002, 3))), closes[i]]
+        if i % 7 == 3:
+            polls.pop()
+        for price in polls:
+            prices = np.append(closes[:i], price)
+            strategy._update_indicators(MarketSnapshot(symbol="BTC-USD", prices=prices,
+                                                       current_price=price, timestamp=i * bar_ns))
+            if i >= 40:
+                assert_matches_batch(prices)
+        # A fresh snapshot of the same poll must not move the state
+        strategy._update_indicators(MarketSnapshot(symbol="BTC-USD", prices=prices,
+                                                   current_price=polls[-1], timestamp=i * bar_ns))
+        if i >= 40:
+            assert_matches_batch(prices)
+    
+    # A feed whose history leaves out the current price (PaperExchange) keeps every bar
+    history = closes[::-1].copy()
+    strategy._update_indicators(MarketSnapshot(symbol="BTC-USD", prices=history,
+                                               current_price=45000.0, timestamp=closes.size * bar_ns))
+    assert_matches_batch(np.append(history, 45000.0))
+    
+    print("Repeated bars revise streaming state in place!")
+
+def test_consecutive_losses_block_entries():
+    """Two losing round trips must hold the next entry until equity recovers."""
+    strategy = your_strategy.HighConvictionUltraProfitStrategy(
+        {"consecutive_loss_limit": 2, "min_time_between_trades": 0}, None, warmup=False
+    )
+    portfolio = Portfolio(symbol="BTC-USD", cash=10000.0, quantity=0.0)
+    bar_ns = np.int64(3600 * 10**9)
+    bar = 0
+    
+    def step(price, score):
+        nonlocal bar
+        bar += 1
+        # Pin the conviction score; only the risk logic is under test here
+        strategy._high_conviction_signal = lambda market: (score, (score, 0.0, 0.0))
+        market = MarketSnapshot(symbol="BTC-USD", prices=np.full(30, price),
+                                current_price=price, timestamp=bar * bar_ns)
+        signal = strategy.generate_signal(market, portfolio)
+        if signal.action == "buy":
+            portfolio.cash -= signal.size * price
+            portfolio.quantity += signal.size
+        elif signal.action == "sell":
+            portfolio.cash += portfolio.quantity * price
+            portfolio.quantity = 0.0
+        if signal.action != "hold":
+            strategy.on_trade(signal, price, signal.size, market.timestamp)
+        return signal
+    
+    # Buy at 100, then a 6% drop trips the trailing stop: a losing round trip each
+    for losses in (1, 2):
+        assert step(100.0, 1.0).action == "buy"
+        assert step(94.0, -1.0).action == "sell"
+        assert strategy._consecutive_losses == losses
+    assert list(strategy._win_loss_history) == [False, False]
+    
+    signal = step(100.0, 1.0)
+    assert signal.action == "hold" and signal.reason == "Drawdown limit exceeded"
+    
+    print("Consecutive losses block new entries!")
+
+def test_backtest_replay_metrics():
+    """A replay over a stored history must report the hand-computed trades."""
+    from reports import backtest_runner
+    
+    strategy_cls = your_strategy.HighConvictionUltraProfitStrategy
+    config = {
+        "base_position_pct": 0.5, "max_position_pct": 0.5, "trailing_stop_pct": 0.05,
+        "min_time_between_trades": 0, "max_drawdown_pct": 1.0,
+    }
+    # Flat through the 26-bar warmup, then two round trips closed by the 5% trailing stop:
+    # buy 50 @ 100, sell @ 104 (+200); buy 5100/104 @ 104, sell @ 98 (-294.23)
+    closes = np.array([100.0] * 26 + [110.0, 104.0, 104.0, 98.0], dtype=np.float32)
+    final_equity = 5100.0 + 5100.0 / 104.0 * 98.0
+    
+    data_dir, signal = backtest_runner.DATA_DIR, strategy_cls._high_conviction_signal
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            np.save(Path(tmp) / "TEST-USD.npy", closes)
+            backtest_runner.DATA_DIR = Path(tmp)
+            # Always bullish: every flat bar buys and only the trailing stop sells
+            strategy_cls._high_conviction_signal = lambda self, market: (1.0, (1.0, 0.0, 0.0))
+            result = backtest_runner.run_single_backtest("TEST-USD", config)
+    finally:
+        backtest_runner.DATA_DIR, strategy_cls._high_conviction_signal = data_dir, signal
+    
+    assert result["num_trades"] == 4
+    assert result["win_rate"] == 0.5
+    assert np.isclose(result["total_pnl"], final_equity - 10000.0)
+    # Peak equity 10500 at 110, trough at the final close
+    assert np.isclose(result["max_drawdown_pct"], 1 - final_equity / 10500.0)
+    
+    print("Backtest replay reports the expected metrics!")
+
+def test_state_round_trip():
+    """Persisted state must restore the trade clocks and derived counters."""
+    strategy = your_strategy.HighConvictionUltraProfitStrategy({}, None, warmup=False)
+    strategy._last_signal = "buy"
+    strategy._entry_price = 45000.0
+    strategy._entry_time = 1_700_000_000.0
+    strategy._last_trade_time = 1_700_003_600.0
+    strategy._win_loss_history.extend([True, False, True, True, True, False, True])
+    
+    # get_state refreshes one dict in place
+    state = strategy.get_state()
+    assert strategy.get_state() is state
+    
+    orjson = your_strategy.orjson
+    try:
+        for serializer in (orjson, None):  # None exercises the stdlib json fallback
+            your_strategy.orjson = serializer
+            restored = your_strategy.HighConvictionUltraProfitStrategy({}, None, warmup=False)
+            loads = serializer.loads if serializer is not None else json.loads
+            restored.set_state(loads(strategy.dump_state()))
+            assert restored._last_signal == "buy" and restored._entry_price == 45000.0
+            assert restored._entry_time == strategy._entry_time
+            assert restored._last_trade_time == strategy._last_trade_time
+            assert list(restored._win_loss_history) == list(strategy._win_loss_history)
+            # Wins among the last five trades: True, True, True, False, True
+            assert restored._recent_wins_5 == 4
+    finally:
+        your_strategy.orjson = orjson
+    
+    print("Strategy state survives a persistence round trip!")
+
 if __name__ == "__main__":
-    test_strategy()
\ No newline at end of file
+    test_strategy()
+    test_streaming_matches_batch_kernels()
+    test_batch_signals_match_per_tick_conviction()
+    test_repeated_bar_revises_streaming_state()
+    test_consecutive_losses_block_entries()
+    test_backtest_replay_metrics()
+    test_state_round_trip()
\ No newline at end of file
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""Numba-compiled indicator kernels for the high-conviction strategy.
+
+Every kernel maps a ``float32`` or ``float64`` close array to output arrays
+of the same length and dtype. Running sums are always accumulated in
+``float64`` and only the stored outputs are downcast, so ``float32``
+histories halve memory traffic without drifting over long sequences. Bars
+inside an indicator's warmup window are ``NaN``.
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+try:  # numba is optional during local development
+    from numba import njit, prange
+except ImportError:  # pragma: no cover - kernels fall back to plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+    prange = range
+
+
+def span_alpha(span: int) -> float:
+    """Smoothing constant of a span-based EMA."""
+    return 2.0 / (span + 1)
+
+
+def wilder_alpha(period: int) -> float:
+    """Smoothing constant of Wilder's moving average."""
+    return 1.0 / period
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def ewma(x: np.ndarray, alpha: float, seed_period: int) -> np.ndarray:
+    """Exponentially weighted mean (``adjust=False``) seeded with an SMA.
+
+    The first ``seed_period`` samples are averaged to start the recurrence;
+    earlier outputs are ``NaN``. ``seed_period=1`` seeds with ``x[0]``.
+    """
+    out = np.full(x.size, np.nan, dtype=x.dtype)
+    if x.size < seed_period:
+        return out
+    decay = 1.0 - alpha
+    acc = 0.0
+    for i in range(seed_period):
+        acc += np.float64(x[i])
+    acc /= seed_period
+    out[seed_period - 1] = acc
+    for i in range(seed_period, x.size):
+        acc = alpha * x[i] + decay * acc
+        out[i] = acc
+    return out
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def rsi_wilder(close: np.ndarray, period: int, alpha: float) -> np.ndarray:
+    """Relative Strength Index with Wilder smoothing (``alpha = 1 / period``)."""
+    n = close.size
+    out = np.full(n, np.nan, dtype=close.dtype)
+    if n < 2:
+        return out
+    decay = 1.0 - alpha
+    delta = np.float64(close[1]) - np.float64(close[0])
+    avg_gain = delta if delta > 0 else 0.0
+    avg_loss = -delta if delta < 0 else 0.0
+    for i in range(1, n):
+        if i > 1:
+            delta = np.float64(close[i]) - np.float64(close[i - 1])
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            avg_gain = alpha * gain + decay * avg_gain
+            avg_loss = alpha * loss + decay * avg_loss
+        if i < period:
+            continue
+        if avg_loss == 0:
+            out[i] = 100.0 if avg_gain > 0 else 50.0
+        else:
+            out[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    return out
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def bbands(close: np.ndarray, period: int, nstd: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Bollinger Bands (middle, upper, lower) using population std."""
+    n = close.size
+    middle = np.full(n, np.nan, dtype=close.dtype)
+    upper = np.full(n, np.nan, dtype=close.dtype)
+    lower = np.full(n, np.nan, dtype=close.dtype)
+    total = 0.0
+    total_sq = 0.0
+    for i in range(n):
+        price = np.float64(close[i])
+        total += price
+        total_sq += price * price
+        if i >= period:
+            old = np.float64(close[i - period])
+            total -= old
+            total_sq -= old * old
+        if i + 1 >= period:
+            mean = total / period
+            var = total_sq / period - mean * mean
+            std = np.sqrt(var) if var > 0 else 0.0
+            middle[i] = mean
+            upper[i] = mean + nstd * std
+            lower[i] = mean - nstd * std
+    return middle, upper, lower
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def macd(close: np.ndarray, fast: int, fast_alpha: float, slow: int, slow_alpha: float,
+         signal: int, signal_alpha: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """MACD line, signal line and histogram from SMA-seeded span EMAs.
+
+    Each period comes with its smoothing constant (``span_alpha(period)``).
+    The line starts at bar ``slow - 1`` and the signal ``signal - 1`` bars
+    later, each seeded with the mean of its first window.
+    """
+    fast_ema = ewma(close, fast_alpha, fast)
+    slow_ema = ewma(close, slow_alpha, slow)
+    macd_line = fast_ema - slow_ema
+    signal_line = np.full(close.size, np.nan, dtype=close.dtype)
+    start = slow - 1
+    if close.size > start:
+        signal_line[start:] = ewma(macd_line[start:], signal_alpha, signal)
+    return macd_line, signal_line, macd_line - signal_line
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def volatility(close: np.ndarray, window: int) -> float:
+    """Population std of simple returns over the last ``window`` closes.
+
+    Returns with a non-positive base price are skipped. ``NaN`` if fewer than
+    ``window`` closes are available, ``0.0`` if fewer than two returns remain.
+    The strategy streams this through :class:`streaming.VolState`; the kernel
+    is kept as its batch reference.
+    """
+    n = close.size
+    if n < window:
+        return np.nan
+    start = n - window
+    total = 0.0
+    count = 0
+    for i in range(start + 1, n):
+        prev = np.float64(close[i - 1])
+        if prev > 0:
+            total += (np.float64(close[i]) - prev) / prev
+            count += 1
+    if count < 2:
+        return 0.0
+    mean = total / count
+    total_sq = 0.0
+    for i in range(start + 1, n):
+        prev = np.float64(close[i - 1])
+        if prev > 0:
+            dev = (np.float64(close[i]) - prev) / prev - mean
+            total_sq += dev * dev
+    return np.sqrt(total_sq / count)
+
+
+# No fastmath here: it assumes no NaNs and would drop the warmup checks
+@njit(cache=True, nogil=True)
+def conviction_signals(close: np.ndarray, params: tuple) -> np.ndarray:
+    """Conviction filter for every bar: 1 buy, -1 sell, 0 hold.
+
+    ``params`` is ``(rsi_period, rsi_alpha, rsi_oversold, rsi_overbought,
+    bb_period, bb_nstd, fast, fast_alpha, slow, slow_alpha, signal,
+    signal_alpha, w_rsi, w_bb, w_macd, threshold)``.
+    Scores match the strategy's per-tick conviction; bars before the longest
+    indicator window hold.
+    """
+    (rsi_period, rsi_alpha, rsi_oversold, rsi_overbought, bb_period, bb_nstd,
+     fast, fast_alpha, slow, slow_alpha, signal, signal_alpha,
+     w_rsi, w_bb, w_macd, threshold) = params
+    n = close.size
+    out = np.zeros(n, dtype=np.int8)
+    rsi = rsi_wilder(close, rsi_period, rsi_alpha)
+    _, upper, lower = bbands(close, bb_period, bb_nstd)
+    _, _, hist = macd(close, fast, fast_alpha, slow, slow_alpha, signal, signal_alpha)
+    os_inv = 1.0 / rsi_oversold
+    ob_inv = 1.0 / (100.0 - rsi_overbought)
+    for i in range(max(rsi_period, bb_period, slow) - 1, n):
+        price = np.float64(close[i])
+        score = 0.0
+        if not np.isnan(rsi[i]):
+            value = np.float64(rsi[i])
+            score += w_rsi * (max(0.0, (rsi_oversold - value) * os_inv)
+                              - max(0.0, (value - rsi_overbought) * ob_inv))
+        if not np.isnan(lower[i]):
+            lo = np.float64(lower[i])
+            hi = np.float64(upper[i])
+            score += w_bb * (min(1.0, max(0.0, (lo - price) / lo * 2))
+                             - min(1.0, max(0.0, (price - hi) / hi * 2)))
+        if not np.isnan(hist[i]):
+            score += w_macd * min(1.0, max(-1.0, np.float64(hist[i]) * 10))
+        if abs(score) >= threshold:
+            out[i] = 1 if score > 0 else -1
+    return out
+
+
+@njit(cache=True, parallel=True)
+def conviction_signals_multi(closes: np.ndarray, params: tuple) -> np.ndarray:
+    """:func:`conviction_signals` for each row of a (symbols, bars) matrix, in parallel."""
+    out = np.zeros(closes.shape, dtype=np.int8)
+    for row in prange(closes.shape[0]):
+        out[row] = conviction_signals(closes[row], params)
+    return out
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""O(1) streaming indicator state for live ``generate_signal`` calls.
+
+Each state is cold-started once from historical closes through the batch
+kernels in :mod:`indicators_nb` and then advanced one price at a time. The
+recurrences match the batch kernels, so ``seed(prices[:-1])`` followed by
+``update(prices[-1])`` yields the same value as the batch computation.
+``replace(price)`` revises the bar folded in by the last ``update`` instead,
+for a still-open candle that is polled more than once.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+from indicators_nb import ewma
+
+
+class EMAState:
+    """Exponential moving average seeded with the mean of its first ``period`` samples."""
+
+    __slots__ = ("alpha", "decay", "period", "value", "total", "count",
+                 "prior_value", "prior_total")
+
+    def __init__(self, alpha: float, period: int = 1):
+        self.alpha = alpha
+        self.decay = 1.0 - alpha
+        self.period = period
+        self.value = math.nan
+        self.total = 0.0
+        self.count = 0
+        # State before the last update, so replace() can redo it
+        self.prior_value = math.nan
+        self.prior_total = 0.0
+
+    def seed(self, prices: np.ndarray, smoothed: Optional[np.ndarray] = None) -> None:
+        """Cold-start from ``prices``; ``smoothed`` is their ``ewma`` if already computed."""
+        self.count = len(prices)
+        if self.count < self.period:
+            self.total = float(np.sum(prices, dtype=np.float64))
+            self.value = math.nan
+        else:
+            if smoothed is None:
+                smoothed = ewma(prices, self.alpha, self.period)
+            self.value = float(smoothed[-1])
+
+    def update(self, price: float) -> float:
+        self.prior_value = self.value
+        self.prior_total = self.total
+        self.count += 1
+        return self.replace(price)
+
+    def replace(self, price: float) -> float:
+        if self.count > self.period:
+            self.value = self.alpha * price + self.decay * self.prior_value
+        else:
+            self.total = self.prior_total + price
+            if self.count == self.period:
+                self.value = self.total / self.period
+        return self.value
+
+
+class RSIState:
+    """Relative Strength Index with Wilder smoothing."""
+
+    __slots__ = ("period", "alpha", "decay", "avg_gain", "avg_loss", "prev_price", "count",
+                 "prior_gain", "prior_loss", "prior_price")
+
+    def __init__(self, period: int, alpha: float):
+        self.period = period
+        self.alpha = alpha
+        self.decay = 1.0 - alpha
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.prev_price: Optional[float] = None
+        self.count = 0
+        # State before the last update, so replace() can redo it
+        self.prior_gain = 0.0
+        self.prior_loss = 0.0
+        self.prior_price: Optional[float] = None
+
+    def seed(self, prices: np.ndarray) -> None:
+        self.count = len(prices)
+        if self.count == 0:
+            self.prev_price = None
+            return
+        self.prev_price = float(prices[-1])
+        if self.count < 2:
+            return
+        delta = np.diff(prices)
+        self.avg_gain = float(ewma(np.where(delta > 0, delta, 0.0), self.alpha, 1)[-1])
+        self.avg_loss = float(ewma(np.where(delta < 0, -delta, 0.0), self.alpha, 1)[-1])
+
+    def update(self, price: float) -> Optional[float]:
+        self.prior_gain, self.prior_loss = self.avg_gain, self.avg_loss
+        self.prior_price = self.prev_price
+        self.count += 1
+        return self.replace(price)
+
+    def replace(self, price: float) -> Optional[float]:
+        if self.prior_price is not None:
+            delta = price - self.prior_price
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            if self.count == 2:
+                self.avg_gain, self.avg_loss = gain, loss
+            else:
+                self.avg_gain = self.alpha * gain + self.decay * self.prior_gain
+                self.avg_loss = self.alpha * loss + self.decay * self.prior_loss
+        self.prev_price = price
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        if self.count <= self.period:
+            return None
+        if self.avg_loss == 0:
+            return 100.0 if self.avg_gain > 0 else 50.0
+        return 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+
+
+class BBState:
+    """Bollinger Bands over a fixed-size ring buffer with running sums."""
+
+    __slots__ = ("period", "inv_period", "nstd", "buffer", "head", "total", "total_sq", "count",
+                 "prior_old", "prior_total", "prior_total_sq")
+
+    def __init__(self, period: int, nstd: float):
+        self.period = period
+        self.inv_period = 1.0 / period
+        self.nstd = nstd
+        self.buffer = np.empty(period, dtype=np.float64)
+        self.head = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.count = 0
+        # State before the last update, so replace() can redo it
+        self.prior_old = 0.0
+        self.prior_total = 0.0
+        self.prior_total_sq = 0.0
+
+    def seed(self, prices: np.ndarray) -> None:
+        tail = np.asarray(prices[-self.period:], dtype=np.float64)
+        self.buffer[:tail.size] = tail
+        self.head = tail.size % self.period
+        self.total = float(tail.sum())
+        self.total_sq = float(np.dot(tail, tail))
+        self.count = len(prices)
+
+    def update(self, price: float) -> Optional[Tuple[float, float, float]]:
+        self.prior_old = self.buffer[self.head] if self.count >= self.period else 0.0
+        self.prior_total, self.prior_total_sq = self.total, self.total_sq
+        self.head = (self.head + 1) % self.period
+        self.count += 1
+        return self.replace(price)
+
+    def replace(self, price: float) -> Optional[Tuple[float, float, float]]:
+        old = self.prior_old
+        self.buffer[self.head - 1] = price
+        self.total = self.prior_total - old + price
+        self.total_sq = self.prior_total_sq - old * old + price * price
+        if self.head == 0:
+            # Resync once per lap so rounding in the running sums can't drift.
+            self.total = float(self.buffer.sum())
+            self.total_sq = float(np.dot(self.buffer, self.buffer))
+        return self.value
+
+    @property
+    def value(self) -> Optional[Tuple[float, float, float]]:
+        if self.count < self.period:
+            return None
+        mean = self.total * self.inv_period
+        var = self.total_sq * self.inv_period - mean * mean
+        std = math.sqrt(var) if var > 0 else 0.0
+        return (mean, mean + self.nstd * std, mean - self.nstd * std)
+
+
+class VolState:
+    """Population std of simple returns over the last ``window`` closes.
+
+    Keeps the ``window - 1`` trailing returns in a ring with running sums.
+    Returns off a non-positive price are skipped, as in
+    :func:`indicators_nb.volatility`.
+    """
+
+    __slots__ = ("window", "returns", "valid", "head", "total", "total_sq",
+                 "valid_count", "prev_price", "count", "prior_ret", "prior_valid",
+                 "prior_total", "prior_total_sq", "prior_valid_count", "prior_price")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.returns = np.zeros(window - 1, dtype=np.float64)
+        self.valid = np.zeros(window - 1, dtype=bool)
+        self.head = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.valid_count = 0
+        self.prev_price: Optional[float] = None
+        self.count = 0
+        # State before the last update, so replace() can redo it
+        self.prior_ret = 0.0
+        self.prior_valid = 0
+        self.prior_total = 0.0
+        self.prior_total_sq = 0.0
+        self.prior_valid_count = 0
+        self.prior_price: Optional[float] = None
+
+    def seed(self, prices: np.ndarray) -> None:
+        tail = np.asarray(prices[-self.window:], dtype=np.float64)
+        self.count = len(prices)
+        self.prev_price = float(tail[-1]) if tail.size else None
+        base = tail[:-1]
+        ok = base > 0
+        returns = np.where(ok, (tail[1:] - base) / np.where(ok, base, 1.0), 0.0)
+        # A re-seed with a short history must not keep the last run's slots
+        self.returns[:] = 0.0
+        self.valid[:] = False
+        self.returns[:returns.size] = returns
+        self.valid[:returns.size] = ok
+        self.head = returns.size % self.returns.size
+        self.total = float(returns.sum())
+        self.total_sq = float(np.dot(returns, returns))
+        self.valid_count = int(ok.sum())
+
+    def update(self, price: float) -> Optional[float]:
+        self.prior_price = self.prev_price
+        if self.prior_price is not None:
+            self.prior_ret = self.returns[self.head]
+            self.prior_valid = int(self.valid[self.head])
+            self.prior_total, self.prior_total_sq = self.total, self.total_sq
+            self.prior_valid_count = self.valid_count
+            self.head = (self.head + 1) % self.returns.size
+        self.count += 1
+        return self.replace(price)
+
+    def replace(self, price: float) -> Optional[float]:
+        prev = self.prior_price
+        if prev is not None:
+            old = self.prior_ret
+            ok = prev > 0
+            ret = (price - prev) / prev if ok else 0.0
+            self.returns[self.head - 1] = ret
+            self.valid[self.head - 1] = ok
+            self.total = self.prior_total - old + ret
+            self.total_sq = self.prior_total_sq - old * old + ret * ret
+            self.valid_count = self.prior_valid_count - self.prior_valid + ok
+            if self.head == 0:
+                # Resync once per lap so rounding in the running sums can't drift.
+                self.total = float(self.returns.sum())
+                self.total_sq = float(np.dot(self.returns, self.returns))
+                self.valid_count = int(self.valid.sum())
+        self.prev_price = price
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        if self.count < self.window:
+            return None
+        if self.valid_count < 2:
+            return 0.0
+        mean = self.total / self.valid_count
+        var = self.total_sq / self.valid_count - mean * mean
+        return math.sqrt(var) if var > 0 else 0.0
+
+
+class MACDState:
+    """MACD line, signal line and histogram from three chained SMA-seeded EMAs."""
+
+    __slots__ = ("fast", "slow", "signal")
+
+    def __init__(self, fast: int, fast_alpha: float, slow: int, slow_alpha: float,
+                 signal: int, signal_alpha: float):
+        self.fast = EMAState(fast_alpha, fast)
+        self.slow = EMAState(slow_alpha, slow)
+        self.signal = EMAState(signal_alpha, signal)
+
+    def seed(self, prices: np.ndarray) -> None:
+        # Each EMA runs over the history once; the line is built from the same arrays
+        fast = ewma(prices, self.fast.alpha, self.fast.period)
+        slow = ewma(prices, self.slow.alpha, self.slow.period)
+        self.fast.seed(prices, fast)
+        self.slow.seed(prices, slow)
+        start = self.slow.period - 1
+        self.signal.seed(fast[start:] - slow[start:])
+
+    def update(self, price: float) -> Optional[Tuple[float, float, float]]:
+        line = self.fast.update(price) - self.slow.update(price)
+        if self.slow.count >= self.slow.period:
+            self.signal.update(line)
+        return self.value
+
+    def replace(self, price: float) -> Optional[Tuple[float, float, float]]:
+        line = self.fast.replace(price) - self.slow.replace(price)
+        if self.slow.count >= self.slow.period:
+            self.signal.replace(line)
+        return self.value
+
+    @property
+    def value(self) -> Optional[Tuple[float, float, float]]:
+        if self.signal.count < self.signal.period:
+            return None
+        line = self.fast.value - self.slow.value
+        return (line, self.signal.value, line - self.signal.value)
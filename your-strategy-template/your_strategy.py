@@ -11,12 +11,20 @@ This strategy focuses on maximizing profits while maintaining high win rate:
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
-from zoneinfo import ZoneInfo
-from statistics import pstdev, mean
+from datetime import datetime, timezone
+import json
 import logging
-import math
-from typing import Any, Dict, Optional, List, Tuple
+from collections import deque
+from itertools import islice
+from dataclasses import dataclass, fields
+from typing import Any, Deque, Dict, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+try:  # orjson is optional; state serialisation falls back to stdlib json
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
 
 # Import base infrastructure from base-bot-template
 import sys
@@ -33,14 +41,52 @@ sys.path.insert(0, base_path)
 from strategy_interface import BaseStrategy, Signal, register_strategy
 from exchange_interface import MarketSnapshot
 
+from indicators_nb import conviction_signals, conviction_signals_multi, span_alpha, wilder_alpha
+from streaming import BBState, MACDState, RSIState, VolState
+
 
 # ----------------------------- Custom strategy helpers -----------------------------
 
-def _utc_iso(dt: datetime) -> str:
-    """Return ISO timestamp with UTC tzinfo (seconds precision)."""
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    return dt.isoformat(timespec="seconds")
+_ACTIONS = ("hold", "buy", "sell")
+_CONVICTION_WEIGHTS = (0.4, 0.3, 0.3)  # RSI, Bollinger, MACD
+_VOL_WINDOW = 20  # closes in the return-volatility window used for sizing
+
+
+def _utc_datetime(epoch_s: float) -> datetime:
+    """Return epoch seconds as an aware UTC datetime (seconds precision)."""
+    return datetime.fromtimestamp(int(epoch_s), tz=timezone.utc)
+
+
+def _state_time(value) -> float:
+    """Epoch seconds from a persisted time: a datetime or an ISO string."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return _epoch_s(value)
+
+
+def _epoch_s(ts) -> float:
+    """Return a snapshot timestamp as float seconds since the epoch.
+
+    Accepts datetimes (naive values are assumed UTC) or int64 epoch-ns.
+    """
+    if not isinstance(ts, datetime):
+        return int(ts) / 1e9
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
+
+_LOG_KINDS = ("DECISION", "RISK", "ACTION")
+
+
+class _KindAdapter(logging.LoggerAdapter):
+    """Prefix records with ``[HIGH_CONVICTION/<kind>]``; only runs for emitted records."""
+
+    def process(self, msg, kwargs):
+        return f"[HIGH_CONVICTION/{self.extra['kind']}] {msg}", kwargs
+
+
+_TRUTHY = frozenset({"1", "true", "yes", "on", "y", "t"})
 
 
 def _as_bool(val, default: bool = False) -> bool:
@@ -49,8 +95,59 @@ def _as_bool(val, default: bool = False) -> bool:
         return default
     if isinstance(val, bool):
         return val
-    s = str(val).strip().lower()
-    return s in ("1", "true", "yes", "on")
+    return str(val).strip().lower() in _TRUTHY
+
+
+# --------------------------------- Strategy configuration --------------------------------------
+
+@dataclass(frozen=True, slots=True)
+class StrategyConfig:
+    """Typed, immutable parameters for HighConvictionUltraProfitStrategy."""
+
+    # High-Conviction Signal Generation
+    conviction_threshold: float = 0.9
+    rsi_period: int = 14
+    rsi_overbought: float = 80.0
+    rsi_oversold: float = 20.0
+    bb_period: int = 20
+    bb_std: float = 2.0
+    macd_fast: int = 12
+    macd_slow: int = 26
+    macd_signal: int = 9
+
+    # Aggressive Position Sizing
+    base_position_pct: float = 0.15               # 15% of portfolio per trade
+    max_position_pct: float = 0.4                 # Max 40% of portfolio
+    conviction_position_multiplier: float = 2.0
+
+    # Optimal Risk/Reward
+    stop_loss_pct: float = 0.03                   # 3% stop loss
+    take_profit_pct: float = 0.15                 # 15% take profit
+    trailing_stop_pct: float = 0.05               # 5% trailing stop
+
+    # Risk Management
+    max_drawdown_pct: float = 0.2                 # 20% max drawdown
+    consecutive_loss_limit: int = 2
+
+    # Trade Management
+    max_trades: int = 30
+    min_time_between_trades: int = 6              # Hours
+
+    # Falls back to the STRATEGY_LOCAL_LOGS env var when unset
+    strategy_local_logs: Optional[Any] = None
+
+    @classmethod
+    def from_mapping(cls, config: Mapping[str, Any]) -> "StrategyConfig":
+        """Coerce raw strategy_params, ignoring keys this strategy doesn't use."""
+        values = {}
+        for spec in fields(cls):
+            value = config.get(spec.name)
+            if value is None:
+                continue
+            if isinstance(spec.default, (int, float)):
+                value = type(spec.default)(value)
+            values[spec.name] = value
+        return cls(**values)
 
 
 # --------------------------------- High-Conviction Ultra-Profit Strategy --------------------------------------
@@ -66,234 +163,278 @@ class HighConvictionUltraProfitStrategy(BaseStrategy):
     5. Advanced Profit Maximization
     """
 
-    def __init__(self, config: Dict[str, Any], exchange):
+    def __init__(self, config: Union[StrategyConfig, Mapping[str, Any]], exchange, warmup: bool = True):
+        if not isinstance(config, StrategyConfig):
+            config = StrategyConfig.from_mapping(config)
         super().__init__(config=config, exchange=exchange)
         
         # Strategy parameters
         # High-Conviction Signal Generation
-        self.conviction_threshold = float(config.get("conviction_threshold", 0.9))
-        self.rsi_period = int(config.get("rsi_period", 14))
-        self.rsi_overbought = float(config.get("rsi_overbought", 80))
-        self.rsi_oversold = float(config.get("rsi_oversold", 20))
-        self.bb_period = int(config.get("bb_period", 20))
-        self.bb_std = float(config.get("bb_std", 2.0))
-        self.macd_fast = int(config.get("macd_fast", 12))
-        self.macd_slow = int(config.get("macd_slow", 26))
-        self.macd_signal = int(config.get("macd_signal", 9))
+        self.conviction_threshold = config.conviction_threshold
+        self.rsi_period = config.rsi_period
+        self.rsi_overbought = config.rsi_overbought
+        self.rsi_oversold = config.rsi_oversold
+        self.bb_period = config.bb_period
+        self.bb_std = config.bb_std
+        self.macd_fast = config.macd_fast
+        self.macd_slow = config.macd_slow
+        self.macd_signal = config.macd_signal
         
         # Aggressive Position Sizing
-        self.base_position_pct = float(config.get("base_position_pct", 0.15))   # 15% of portfolio per trade
-        self.max_position_pct = float(config.get("max_position_pct", 0.4))     # Max 40% of portfolio
-        self.conviction_position_multiplier = float(config.get("conviction_position_multiplier", 2.0))
+        self.base_position_pct = config.base_position_pct
+        self.max_position_pct = config.max_position_pct
+        self.conviction_position_multiplier = config.conviction_position_multiplier
         
         # Optimal Risk/Reward
-        self.stop_loss_pct = float(config.get("stop_loss_pct", 0.03))          # 3% stop loss
-        self.take_profit_pct = float(config.get("take_profit_pct", 0.15))      # 15% take profit
-        self.trailing_stop_pct = float(config.get("trailing_stop_pct", 0.05))  # 5% trailing stop
+        self.stop_loss_pct = config.stop_loss_pct
+        self.take_profit_pct = config.take_profit_pct
+        self.trailing_stop_pct = config.trailing_stop_pct
         
         # Risk Management
-        self.max_drawdown_pct = float(config.get("max_drawdown_pct", 0.2))     # 20% max drawdown
-        self.consecutive_loss_limit = int(config.get("consecutive_loss_limit", 2))
+        self.max_drawdown_pct = config.max_drawdown_pct
+        self.consecutive_loss_limit = config.consecutive_loss_limit
         
         # Trade Management
-        self.max_trades = int(config.get("max_trades", 30))
-        self.min_time_between_trades = int(config.get("min_time_between_trades", 6))  # Hours
+        self.max_trades = config.max_trades
+        self.min_time_between_trades = config.min_time_between_trades
         
         # Internal state
         self._last_signal: Optional[str] = None
         self._entry_price: Optional[float] = None
-        self._entry_time: Optional[datetime] = None
+        self._entry_time: Optional[float] = None  # epoch seconds
+        self._exit_entry_price: Optional[float] = None  # entry of the position being sold, until on_trade
         self._trailing_high: Optional[float] = None
         self._trailing_low: Optional[float] = None
         self._consecutive_losses = 0
         self._peak_portfolio_value = 0.0
+        local_logs = config.strategy_local_logs
         self._local_logs_enabled = _as_bool(
-            config.get("strategy_local_logs", os.getenv("STRATEGY_LOCAL_LOGS", "true")), True
+            local_logs if local_logs is not None else os.getenv("STRATEGY_LOCAL_LOGS", "true"), True
         )
         self._logger = logging.getLogger("strategy.high_conviction")
+        self._loggers = {kind: _KindAdapter(self._logger, {"kind": kind}) for kind in _LOG_KINDS}
         
         # Advanced components state
-        self._price_history: List[float] = []
-        self._win_loss_history: List[bool] = []
+        self._win_loss_history: Deque[bool] = deque(maxlen=100)
+        self._recent_wins_5 = 0  # wins among the last five entries of _win_loss_history
         self._trade_count = 0
-        self._last_trade_time: Optional[datetime] = None
+        self._last_trade_time: Optional[float] = None  # epoch seconds
         self._recent_performance_score = 1.0
 
-    # --------------------------- local logging utils ---------------------------
+        # Smoothing constants, fixed for the strategy's lifetime
+        self._rsi_alpha = wilder_alpha(self.rsi_period)
+        # MACD periods, each followed by its span alpha, as macd() and MACDState take them
+        self._macd_args = (
+            int(self.macd_fast), span_alpha(self.macd_fast),
+            int(self.macd_slow), span_alpha(self.macd_slow),
+            int(self.macd_signal), span_alpha(self.macd_signal),
+        )
+        # Bars needed before any indicator-driven decision is made
+        self._min_history = max(self.rsi_period, self.bb_period, self.macd_slow)
+        # Reciprocal RSI zone widths, so conviction scoring only multiplies
+        self._rsi_os_inv = 1.0 / self.rsi_oversold
+        self._rsi_ob_inv = 1.0 / (100 - self.rsi_overbought)
+
+        # Typed once so every batch call hits the same compiled specialisation
+        self._signal_params = (
+            int(self.rsi_period), float(self._rsi_alpha),
+            float(self.rsi_oversold), float(self.rsi_overbought),
+            int(self.bb_period), float(self.bb_std),
+            *self._macd_args,
+            *map(float, _CONVICTION_WEIGHTS), float(self.conviction_threshold),
+        )
 
-    def _log_local(self, kind: str, msg: str) -> None:
-        """Local, strategy-only logger (no-throw)."""
-        if not self._local_logs_enabled:
-            return
-        try:
-            self._logger.info(f"[HIGH_CONVICTION/{kind}] {msg}")
-        except Exception:
-            pass  # never let logging crash strategy
+        # Streaming indicator state, cold-started from the first snapshot
+        self._rsi_state = RSIState(self.rsi_period, self._rsi_alpha)
+        self._bb_state = BBState(self.bb_period, self.bb_std)
+        self._macd_state = MACDState(*self._macd_args)
+        self._vol_state = VolState(_VOL_WINDOW)
+        # Last bar folded into the streaming state: its time (epoch seconds),
+        # its price and the close before it
+        self._bar_time = float("-inf")
+        self._bar_price: Optional[float] = None
+        self._bar_base: Optional[float] = None
+        # Latest indicator readings, refreshed once per bar by _update_indicators
+        self._rsi_value: Optional[float] = None
+        self._bb_value: Optional[Tuple[float, float, float]] = None
+        self._macd_value: Optional[Tuple[float, float, float]] = None
+        self._vol_value: Optional[float] = None
+
+        # Persisted-state dict, refreshed in place by get_state
+        self._state: Dict[str, Any] = dict.fromkeys((
+            "last_signal", "entry_price", "entry_time", "trailing_high", "trailing_low",
+            "consecutive_losses", "peak_portfolio_value", "trade_count", "last_trade_time",
+            "win_loss_history", "recent_performance_score",
+        ))
+
+        self._warmed = False
+        self._batch_warmed = False
+        if warmup:
+            self.warmup()
+
+    def warmup(self, batch: bool = False) -> None:
+        """Compile the njit kernels before the first real bar.
+
+        Only the streaming cold-start seed runs on the live path, so only it
+        is compiled, for the ``float64`` histories live feeds deliver;
+        ``batch=True`` also compiles :meth:`generate_signals_batch`. Repeat
+        calls are no-ops, and with ``cache=True`` later processes load the
+        compiled code from disk.
+        """
+        if not self._warmed:
+            dummy = np.linspace(1.0, 2.0, 50)
+            RSIState(self.rsi_period, self._rsi_alpha).seed(dummy)
+            MACDState(*self._macd_args).seed(dummy)
+            self._warmed = True
+        if batch and not self._batch_warmed:
+            dummy = np.linspace(1.0, 2.0, 50)
+            conviction_signals(dummy, self._signal_params)
+            conviction_signals_multi(np.stack([dummy, dummy]), self._signal_params)
+            self._batch_warmed = True
+
+    def generate_signals_batch(self, prices: np.ndarray) -> np.ndarray:
+        """Conviction filter over a whole history: int8 1 buy, -1 sell, 0 hold per bar.
+
+        Accepts one close series or a (symbols, bars) matrix, which is screened
+        in parallel. Only the indicator stack and conviction threshold run
+        here; trade spacing, stops and sizing remain in :meth:`generate_signal`.
+        """
+        prices = np.ascontiguousarray(prices)
+        if prices.dtype != np.float32:
+            prices = prices.astype(np.float64, copy=False)
+        if prices.ndim == 2:
+            return conviction_signals_multi(prices, self._signal_params)
+        return conviction_signals(prices, self._signal_params)
+
+    def prepare(self) -> None:
+        """Bot start-up hook; a no-op unless the strategy was built with ``warmup=False``."""
+        self.warmup()
 
-    # --------------------------- Technical indicators --------------------------
+    # --------------------------- local logging utils ---------------------------
 
-    def _calculate_sma(self, prices: list, window: int) -> Optional[float]:
-        """Calculate Simple Moving Average."""
-        if len(prices) < window:
-            return None
-        return sum(prices[-window:]) / window
+    def _log_local(self, kind: str, msg: str, *args: Any) -> None:
+        """Local, strategy-only logger (no-throw).
 
-    def _calculate_rsi(self, prices: list, period: int) -> Optional[float]:
-        """Calculate Relative Strength Index."""
-        if len(prices) < period + 1:
-            return None
-            
-        deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-        gains = [delta if delta > 0 else 0 for delta in deltas[-period:]]
-        losses = [-delta if delta < 0 else 0 for delta in deltas[-period:]]
-        
-        avg_gain = sum(gains) / period
-        avg_loss = sum(losses) / period
-        
-        if avg_loss == 0:
-            return 100 if avg_gain > 0 else 50
-            
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
-
-    def _calculate_bollinger_bands(self, prices: list, period: int, std_dev: float) -> Optional[Tuple[float, float, float]]:
-        """Calculate Bollinger Bands (middle, upper, lower)."""
-        if len(prices) < period:
-            return None
-            
-        middle_band = self._calculate_sma(prices, period)
-        if middle_band is None:
-            return None
-            
-        variance = sum((price - middle_band) ** 2 for price in prices[-period:]) / period
-        std_deviation = math.sqrt(variance)
-        
-        upper_band = middle_band + (std_dev * std_deviation)
-        lower_band = middle_band - (std_dev * std_deviation)
-        
-        return (middle_band, upper_band, lower_band)
+        ``msg`` is a %-style format; ``args`` are only formatted if the
+        record is actually emitted.
+        """
+        if self._local_logs_enabled:
+            # Handlers report their own formatting errors, so nothing can raise here
+            self._loggers[kind].info(msg, *args)
 
-    def _calculate_macd(self, prices: list, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9) -> Optional[Tuple[float, float, float]]:
-        """Calculate MACD (MACD line, Signal line, Histogram)."""
-        if len(prices) < slow_period + signal_period:
-            return None
-            
-        # Calculate EMAs
-        def _calculate_ema(data, period):
-            if len(data) < period:
-                return None
-            k = 2 / (period + 1)
-            ema = data[-period]
-            for price in data[-period+1:]:
-                ema = price * k + ema * (1 - k)
-            return ema
-            
-        fast_ema = _calculate_ema(prices, fast_period)
-        slow_ema = _calculate_ema(prices, slow_period)
-        
-        if fast_ema is None or slow_ema is None:
-            return None
-            
-        macd_line = fast_ema - slow_ema
-        signal_line = _calculate_ema([fast_ema - slow_ema for _ in range(signal_period)], signal_period)
-        
-        if signal_line is None:
-            return None
-            
-        histogram = macd_line - signal_line
-        return (macd_line, signal_line, histogram)
+    # --------------------------- Technical indicators --------------------------
 
-    def _calculate_volatility(self, prices: list, window: int) -> Optional[float]:
-        """Calculate price volatility."""
-        if len(prices) < window:
-            return None
-            
-        window_prices = prices[-window:]
-        returns = []
-        for i in range(1, len(window_prices)):
-            if window_prices[i-1] > 0:
-                returns.append((window_prices[i] - window_prices[i-1]) / window_prices[i-1])
-                
-        if len(returns) < 2:
-            return 0
-            
-        return pstdev(returns)
+    def _update_indicators(self, market: MarketSnapshot) -> None:
+        """Fold the snapshot's current bar into the streaming indicators.
+
+        Keyed on the bar timestamp: a later timestamp advances the states by
+        one bar, the same timestamp (an open candle polled again) revises
+        that bar in place, and a poll with an unchanged price is skipped.
+        When the snapshot's closed bars don't end where the states do (a
+        skipped bar, a revised close, a synthetic history), the states are
+        re-seeded from ``market.prices`` instead.
+        """
+        bar_time = _epoch_s(market.timestamp)
+        price = float(market.current_price)
+        prices = market.prices
+        # Closed bars before the current one; some feeds leave the current price out
+        history = prices[:-1] if len(prices) and prices[-1] == market.current_price else prices
+        base = float(history[-1]) if len(history) else None
+
+        if bar_time == self._bar_time and base == self._bar_base:
+            if price == self._bar_price:
+                return  # this bar at this price is already folded in
+            self._rsi_value = self._rsi_state.replace(price)
+            self._bb_value = self._bb_state.replace(price)
+            self._macd_value = self._macd_state.replace(price)
+            self._vol_value = self._vol_state.replace(price)
+        else:
+            if bar_time <= self._bar_time or base != self._bar_price:
+                # history is a zero-copy view of the snapshot's ndarray
+                self._rsi_state.seed(history)
+                self._bb_state.seed(history)
+                self._macd_state.seed(history)
+                self._vol_state.seed(history)
+            self._rsi_value = self._rsi_state.update(price)
+            self._bb_value = self._bb_state.update(price)
+            self._macd_value = self._macd_state.update(price)
+            self._vol_value = self._vol_state.update(price)
+        self._bar_time, self._bar_price, self._bar_base = bar_time, price, base
 
     # --------------------------- Advanced Strategy Components --------------------------
 
-    def _high_conviction_signal(self, market: MarketSnapshot) -> Tuple[float, str]:
-        """Generate high-conviction signal with multiple confirmations."""
-        if len(market.prices) < max(self.rsi_period, self.bb_period, self.macd_slow):
-            return (0.0, "insufficient_data")
-            
+    def _high_conviction_signal(self, market: MarketSnapshot) -> Tuple[float, Tuple[float, float, float]]:
+        """Generate high-conviction signal with multiple confirmations.
+
+        Returns the conviction score and the signed RSI, Bollinger and MACD
+        scores it was weighted from (buy > 0, sell < 0), all computed with
+        clamps rather than if-chains so the hot path stays branchless.
+        """
         current_price = market.current_price
-        conviction_score = 0.0
-        reasons = []
-        
+
         # 1. RSI Extreme Confirmation
-        rsi = self._calculate_rsi(market.prices, self.rsi_period)
+        rsi_score = 0.0
+        rsi = self._rsi_value
         if rsi is not None:
-            if rsi < self.rsi_oversold:
-                # Oversold condition - potential buy signal
-                rsi_score = (self.rsi_oversold - rsi) / self.rsi_oversold
-                conviction_score += rsi_score * 0.4
-                reasons.append(f"rsi_oversold:{rsi:.2f}")
-            elif rsi > self.rsi_overbought:
-                # Overbought condition - potential sell signal
-                rsi_score = (rsi - self.rsi_overbought) / (100 - self.rsi_overbought)
-                conviction_score -= rsi_score * 0.4
-                reasons.append(f"rsi_overbought:{rsi:.2f}")
-        
+            rsi_score = (
+                max(0.0, (self.rsi_oversold - rsi) * self._rsi_os_inv)
+                - max(0.0, (rsi - self.rsi_overbought) * self._rsi_ob_inv)
+            )
+
         # 2. Bollinger Band Extreme Confirmation
-        bb = self._calculate_bollinger_bands(market.prices, self.bb_period, self.bb_std)
+        bb_score = 0.0
+        bb = self._bb_value
         if bb is not None:
             middle_band, upper_band, lower_band = bb
-            if current_price < lower_band:
-                # Deep oversold - strong buy signal
-                bb_score = min(1.0, (lower_band - current_price) / lower_band * 2)
-                conviction_score += bb_score * 0.3
-                reasons.append(f"bb_oversold:{bb_score:.3f}")
-            elif current_price > upper_band:
-                # Deep overbought - strong sell signal
-                bb_score = min(1.0, (current_price - upper_band) / upper_band * 2)
-                conviction_score -= bb_score * 0.3
-                reasons.append(f"bb_overbought:{bb_score:.3f}")
-        
-        # 3. MACD Confirmation
-        macd_result = self._calculate_macd(market.prices, self.macd_fast, self.macd_slow, self.macd_signal)
+            bb_score = (
+                min(1.0, max(0.0, (lower_band - current_price) / lower_band * 2))
+                - min(1.0, max(0.0, (current_price - upper_band) / upper_band * 2))
+            )
+
+        # 3. MACD Confirmation (histogram sign already encodes line vs signal)
+        macd_score = 0.0
+        macd_result = self._macd_value
         if macd_result is not None:
-            macd_line, signal_line, histogram = macd_result
-            if histogram > 0 and macd_line > signal_line:
-                # Bullish MACD - buy confirmation
-                macd_score = min(1.0, histogram * 10)
-                conviction_score += macd_score * 0.3
-                reasons.append(f"macd_bullish:{macd_score:.3f}")
-            elif histogram < 0 and macd_line < signal_line:
-                # Bearish MACD - sell confirmation
-                macd_score = min(1.0, abs(histogram) * 10)
-                conviction_score -= macd_score * 0.3
-                reasons.append(f"macd_bearish:{macd_score:.3f}")
-        
-        reason = "|".join(reasons) if reasons else "no_conviction"
-        return (conviction_score, reason)
+            macd_score = min(1.0, max(-1.0, macd_result[2] * 10))
+
+        w_rsi, w_bb, w_macd = _CONVICTION_WEIGHTS
+        conviction_score = w_rsi * rsi_score + w_bb * bb_score + w_macd * macd_score
+        return (conviction_score, (rsi_score, bb_score, macd_score))
 
-    def _calculate_optimal_position_size(self, market: MarketSnapshot, portfolio_value: float, conviction_score: float) -> float:
+    def _conviction_reason(self, scores: Tuple[float, float, float]) -> str:
+        """Describe which confirmations fired; only built for actionable signals."""
+        rsi_score, bb_score, macd_score = scores
+        reasons = []
+        if rsi_score > 0:
+            reasons.append(f"rsi_oversold:{self._rsi_value:.2f}")
+        elif rsi_score < 0:
+            reasons.append(f"rsi_overbought:{self._rsi_value:.2f}")
+        if bb_score > 0:
+            reasons.append(f"bb_oversold:{bb_score:.3f}")
+        elif bb_score < 0:
+            reasons.append(f"bb_overbought:{-bb_score:.3f}")
+        if macd_score > 0:
+            reasons.append(f"macd_bullish:{macd_score:.3f}")
+        elif macd_score < 0:
+            reasons.append(f"macd_bearish:{-macd_score:.3f}")
+        return "|".join(reasons) if reasons else "no_conviction"
+
+    def _calculate_optimal_position_size(self, portfolio_value: float, conviction_score: float) -> float:
         """Calculate aggressive position size based on conviction score."""
         # Base position size
         base_size = self.base_position_pct
         
-        # Aggressive scaling based on conviction
-        if conviction_score >= 0.9:
-            position_factor = self.conviction_position_multiplier  # 2x for extremely high conviction
-        elif conviction_score >= 0.8:
-            position_factor = 1.5  # 1.5x for high conviction
-        else:
-            position_factor = 1.0  # Base size for moderate conviction
+        # Aggressive scaling based on conviction: 1x base, 1.5x from 0.8,
+        # conviction_position_multiplier from 0.9 (boolean arithmetic, no branches)
+        position_factor = (
+            1.0
+            + 0.5 * (conviction_score >= 0.8)
+            + (self.conviction_position_multiplier - 1.5) * (conviction_score >= 0.9)
+        )
             
         # Recent performance adjustment
         if len(self._win_loss_history) >= 5:
-            recent_win_rate = sum(self._win_loss_history[-5:]) / 5
+            recent_win_rate = self._recent_wins_5 / 5
             if recent_win_rate < 0.8:
                 performance_factor = 0.7  # Reduce position size after poor performance
             else:
@@ -302,7 +443,8 @@ class HighConvictionUltraProfitStrategy(BaseStrategy):
             performance_factor = 1.0
             
         # Volatility adjustment - increase size in moderate volatility
-        current_vol = self._calculate_volatility(market.prices, 20)
+        # (read from this bar's streaming update, never recomputed here)
+        current_vol = self._vol_value
         if current_vol is not None:
             if current_vol > 0.03:  # High volatility
                 vol_factor = 0.8  # Reduce position in high volatility
@@ -319,7 +461,7 @@ class HighConvictionUltraProfitStrategy(BaseStrategy):
         
         return optimal_size
 
-    def _check_trade_limits(self, now: datetime) -> Tuple[bool, str]:
+    def _check_trade_limits(self, now: float) -> Tuple[bool, str]:
         """Check trade count and frequency limits."""
         # Trade count limit
         if self._trade_count >= self.max_trades:
@@ -328,13 +470,12 @@ class HighConvictionUltraProfitStrategy(BaseStrategy):
         # Time between trades
         if self._last_trade_time is not None:
             time_since_last = now - self._last_trade_time
-            min_interval = timedelta(hours=self.min_time_between_trades)
-            if time_since_last < min_interval:
-                return (False, f"min_time_between_trades_not_met:{time_since_last.total_seconds()/3600:.1f}h")
+            if time_since_last < self.min_time_between_trades * 3600:
+                return (False, f"min_time_between_trades_not_met:{time_since_last/3600:.1f}h")
                 
         return (True, "ok")
 
-    def _check_drawdown_limits(self, portfolio_value: float) -> bool:
+    def _check_drawdown_limits(self, portfolio_value: float, current_price: float, quantity: float) -> bool:
         """Check if drawdown limits are exceeded."""
         if self._peak_portfolio_value == 0:
             self._peak_portfolio_value = portfolio_value
@@ -348,11 +489,11 @@ class HighConvictionUltraProfitStrategy(BaseStrategy):
         # Calculate current drawdown
         drawdown = (self._peak_portfolio_value - portfolio_value) / self._peak_portfolio_value
         
-        # If we have consecutive losses, increase caution
-        if self._last_signal == "sell" and self._entry_price and portfolio_value < self._entry_price:
-            self._consecutive_losses += 1
-        elif self._last_signal == "buy" and self._entry_price and portfolio_value > self._entry_price:
-            self._consecutive_losses = 0  # Reset on profitable trade
+        # Losses are counted in on_trade once a sell fills; a long position
+        # currently in profit (judged by its PnL) clears the streak
+        if self._last_signal == "buy" and self._entry_price:
+            if (current_price - self._entry_price) * quantity > 0:
+                self._consecutive_losses = 0  # Reset on profitable trade
             
         # Stop trading after consecutive loss limit
         if self._consecutive_losses >= self.consecutive_loss_limit:
@@ -368,47 +509,45 @@ class HighConvictionUltraProfitStrategy(BaseStrategy):
 
     def generate_signal(self, market: MarketSnapshot, portfolio) -> Signal:
         """Generate trading signal using high-conviction ultra-profit approach."""
-        now = datetime.now(timezone.utc)
-        
-        # Update internal histories
-        self._price_history.append(market.current_price)
-        if len(self._price_history) > 200:
-            self._price_history = self._price_history[-200:]
+        # Update the indicator state. The O(1) streaming updates run on every
+        # bar so no price is missed; everything after the guards below
+        # (conviction scoring, sizing, reason strings) is skipped on held bars.
+        self._update_indicators(market)
         
         # Need sufficient price history
-        if len(market.prices) < max(self.rsi_period, self.bb_period, self.macd_slow):
+        if len(market.prices) < self._min_history:
             self._log_local("DECISION", "HOLD | reason=insufficient_data")
             return Signal("hold", reason="Insufficient price data")
             
+        # Use the snapshot clock so replayed history honours trade spacing
+        now = _epoch_s(market.timestamp)
         current_price = market.current_price
         portfolio_value = portfolio.cash + portfolio.quantity * current_price
         
-        # Update peak portfolio value
-        if portfolio_value > self._peak_portfolio_value:
-            self._peak_portfolio_value = portfolio_value
+        # Check drawdown limits first: this is also the one place the peak is tracked
+        if not self._check_drawdown_limits(portfolio_value, current_price, portfolio.quantity):
+            self._log_local("RISK", "HOLD | reason=drawdown_limit_exceeded")
+            return Signal("hold", reason="Drawdown limit exceeded")
             
         # Check trade limits
         can_trade, trade_limit_reason = self._check_trade_limits(now)
         if not can_trade:
-            self._log_local("DECISION", f"HOLD | reason=trade_limit | detail={trade_limit_reason}")
+            self._log_local("DECISION", "HOLD | reason=trade_limit | detail=%s", trade_limit_reason)
             return Signal("hold", reason=f"Trade limit: {trade_limit_reason}")
             
-        # Check drawdown limits
-        if not self._check_drawdown_limits(portfolio_value):
-            self._log_local("RISK", "HOLD | reason=drawdown_limit_exceeded")
-            return Signal("hold", reason="Drawdown limit exceeded")
-            
         # Generate high-conviction signal
-        conviction_score, conviction_reason = self._high_conviction_signal(market)
+        conviction_score, conviction_scores = self._high_conviction_signal(market)
         
-        # Apply high-conviction threshold
-        if abs(conviction_score) < self.conviction_threshold:
-            self._log_local("DECISION", f"HOLD | reason=low_conviction | score={conviction_score:.3f}")
+        # Apply high-conviction threshold and direction in one lookup:
+        # 0 = hold, 1 = buy (score > 0), 2 = sell
+        final_signal = _ACTIONS[
+            (abs(conviction_score) >= self.conviction_threshold) * (1 + (conviction_score <= 0))
+        ]
+        if final_signal == "hold":
+            self._log_local("DECISION", "HOLD | reason=low_conviction | score=%.3f", conviction_score)
             return Signal("hold", reason=f"Low conviction: {conviction_score:.3f}")
             
-        # Determine signal direction
-        final_signal = "buy" if conviction_score > 0 else "sell"
-        reason = f"CONVICTION:{conviction_reason}|SCORE:{conviction_score:.3f}"
+        reason = f"CONVICTION:{self._conviction_reason(conviction_scores)}|SCORE:{conviction_score:.3f}"
         
         # Position management
         if final_signal == "buy" and self._last_signal == "buy":
@@ -445,14 +584,14 @@ class HighConvictionUltraProfitStrategy(BaseStrategy):
                 reason = f"TAKE_PROFIT_TRIGGERED | profit:{price_change_pct:.2%}"
                 
             # Time-based exit (moderate for high win rate)
-            elif self._entry_time and (now - self._entry_time).days > 3:
+            elif self._entry_time and (now - self._entry_time) // 86400 > 3:
                 final_signal = "sell"
                 reason = "TIME_BASED_EXIT | position_held_over_3_days"
                 
         # Execute final decision
         if final_signal == "buy":
             # Check if we have cash
-            position_size_pct = self._calculate_optimal_position_size(market, portfolio_value, conviction_score)
+            position_size_pct = self._calculate_optimal_position_size(portfolio_value, conviction_score)
             notional = portfolio.cash * position_size_pct
             if notional <= 0:
                 self._log_local("DECISION", "HOLD | reason=insufficient_cash")
@@ -470,7 +609,10 @@ class HighConvictionUltraProfitStrategy(BaseStrategy):
             self._trailing_low = current_price
             self._last_trade_time = now
             self._trade_count += 1
-            self._log_local("DECISION", f"BUY | reason={reason} | size={size:.8f} | notional=${notional:,.2f} | position_size={position_size_pct:.2%} | score={conviction_score:.3f}")
+            self._log_local(
+                "DECISION", "BUY | reason=%s | size=%.8f | notional=$%.2f | position_size=%.2f%% | score=%.3f",
+                reason, size, notional, position_size_pct * 100, conviction_score,
+            )
             return Signal("buy", size=size, reason=reason)
             
         elif final_signal == "sell":
@@ -481,6 +623,8 @@ class HighConvictionUltraProfitStrategy(BaseStrategy):
                 
             is_stop_loss = "STOP_LOSS" in reason or "TRAILING_STOP" in reason
             self._last_signal = "sell" if is_stop_loss else None
+            # on_trade scores the closed trade against this entry
+            self._exit_entry_price = self._entry_price
             self._entry_price = None
             self._entry_time = None
             self._trailing_high = None
@@ -488,26 +632,29 @@ class HighConvictionUltraProfitStrategy(BaseStrategy):
             self._last_trade_time = now
             self._trade_count += 1
             size = portfolio.quantity
-            self._log_local("DECISION", f"SELL | reason={reason} | size={size:.8f}")
+            self._log_local("DECISION", "SELL | reason=%s | size=%.8f", reason, size)
             return Signal("sell", size=size, reason=reason)
         
         # Default hold
-        self._log_local("DECISION", f"HOLD | reason={reason} | score={conviction_score:.3f}")
+        self._log_local("DECISION", "HOLD | reason=%s | score=%.3f", reason, conviction_score)
         return Signal("hold", reason=reason)
 
     def on_trade(self, signal: Signal, execution_price: float, execution_size: float, timestamp: datetime) -> None:
         """Update internal state after a trade is executed."""
         if signal.action == "buy" and execution_size > 0:
-            self._log_local("ACTION", f"EXECUTED BUY {execution_size:.8f} @ ${execution_price:,.2f}")
+            self._log_local("ACTION", "EXECUTED BUY %.8f @ $%.2f", execution_size, execution_price)
         elif signal.action == "sell" and execution_size > 0:
-            self._log_local("ACTION", f"EXECUTED SELL {execution_size:.8f} @ ${execution_price:,.2f}")
+            self._log_local("ACTION", "EXECUTED SELL %.8f @ $%.2f", execution_size, execution_price)
             
             # Update win/loss history
-            if self._entry_price:
-                is_win = execution_price > self._entry_price
-                self._win_loss_history.append(is_win)
-                if len(self._win_loss_history) > 100:
-                    self._win_loss_history.pop(0)
+            entry_price, self._exit_entry_price = self._exit_entry_price, None
+            if entry_price:
+                is_win = execution_price > entry_price
+                history = self._win_loss_history
+                if len(history) >= 5:
+                    self._recent_wins_5 -= history[-5]  # leaves the five-trade window
+                history.append(is_win)
+                self._recent_wins_5 += is_win
                 
                 # Update consecutive losses counter
                 if not is_win:
@@ -522,20 +669,31 @@ class HighConvictionUltraProfitStrategy(BaseStrategy):
                     self._recent_performance_score = max(0.8, self._recent_performance_score - 0.1)
 
     def get_state(self) -> Dict[str, Any]:
-        """Return strategy state for persistence."""
-        return {
-            "last_signal": self._last_signal,
-            "entry_price": self._entry_price,
-            "entry_time": _utc_iso(self._entry_time) if self._entry_time else None,
-            "trailing_high": self._trailing_high,
-            "trailing_low": self._trailing_low,
-            "consecutive_losses": self._consecutive_losses,
-            "peak_portfolio_value": self._peak_portfolio_value,
-            "trade_count": self._trade_count,
-            "last_trade_time": _utc_iso(self._last_trade_time) if self._last_trade_time else None,
-            "win_loss_history": self._win_loss_history[-50:] if len(self._win_loss_history) > 50 else self._win_loss_history,
-            "recent_performance_score": self._recent_performance_score
-        }
+        """Return strategy state for persistence.
+
+        The same dict is refreshed in place on every call; copy it to keep a
+        snapshot across later calls.
+        """
+        state = self._state
+        state["last_signal"] = self._last_signal
+        state["entry_price"] = self._entry_price
+        state["entry_time"] = _utc_datetime(self._entry_time) if self._entry_time else None
+        state["trailing_high"] = self._trailing_high
+        state["trailing_low"] = self._trailing_low
+        state["consecutive_losses"] = self._consecutive_losses
+        state["peak_portfolio_value"] = self._peak_portfolio_value
+        state["trade_count"] = self._trade_count
+        state["last_trade_time"] = _utc_datetime(self._last_trade_time) if self._last_trade_time else None
+        state["win_loss_history"] = list(self._win_loss_history)[-50:]
+        state["recent_performance_score"] = self._recent_performance_score
+        return state
+
+    def dump_state(self) -> bytes:
+        """Serialise :meth:`get_state` to JSON bytes for persistence."""
+        state = self.get_state()
+        if orjson is not None:
+            return orjson.dumps(state, option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY)
+        return json.dumps(state, default=lambda obj: obj.isoformat()).encode("utf-8")
 
     def set_state(self, state: Dict[str, Any]) -> None:
         """Restore strategy state."""
@@ -543,7 +701,7 @@ class HighConvictionUltraProfitStrategy(BaseStrategy):
         self._entry_price = state.get("entry_price")
         entry_time = state.get("entry_time")
         if entry_time:
-            self._entry_time = datetime.fromisoformat(entry_time)
+            self._entry_time = _state_time(entry_time)
         self._trailing_high = state.get("trailing_high")
         self._trailing_low = state.get("trailing_low")
         self._consecutive_losses = state.get("consecutive_losses", 0)
@@ -551,8 +709,9 @@ class HighConvictionUltraProfitStrategy(BaseStrategy):
         self._trade_count = state.get("trade_count", 0)
         last_trade_time = state.get("last_trade_time")
         if last_trade_time:
-            self._last_trade_time = datetime.fromisoformat(last_trade_time)
-        self._win_loss_history = state.get("win_loss_history", [])
+            self._last_trade_time = _state_time(last_trade_time)
+        self._win_loss_history = deque(state.get("win_loss_history", []), maxlen=100)
+        self._recent_wins_5 = sum(islice(reversed(self._win_loss_history), 5))
         self._recent_performance_score = state.get("recent_performance_score", 1.0)
 
 